@@ -0,0 +1,113 @@
+"""
+Strong and weak scaling benchmark for the parallel cavity flow solver.
+
+Strong scaling keeps the grid fixed and adds workers; weak scaling keeps
+the number of interior rows per worker fixed so the grid grows with the
+worker count. Each parallel run must match the serial solver bitwise;
+the benchmark aborts if it does not, or if the solution diverges. The
+time step is reduced on fine grids to keep the explicit scheme stable.
+
+Usage:
+    python benchmark_scaling.py [--nx 161] [--ny 161] [--nt 100] [--max-workers 8]
+"""
+
+import argparse
+import dataclasses
+import os
+import time
+from typing import Callable, List
+
+import numpy as np
+
+import config
+from cavity_flow import FlowParameters, cavity_flow
+from parallel_cavity_flow import parallel_cavity_flow
+
+
+def _timed(run: Callable[[], tuple]) -> tuple:
+    """Return ``(elapsed_seconds, result)`` for a single call to *run*."""
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def _worker_counts(max_workers: int) -> List[int]:
+    """Powers of two up to *max_workers*, always including *max_workers* itself."""
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def _stable_parameters(nx: int, ny: int) -> FlowParameters:
+    """Parameters for an ``nx x ny`` grid with ``dt`` inside the diffusion limit.
+
+    The explicit scheme needs ``nu * dt / dx**2 <= 0.25``; ``config.DT`` is
+    kept on coarse grids and scaled down (with a safety factor) on fine ones.
+    """
+    params = FlowParameters.from_config(nx=nx, ny=ny)
+    dt_limit = 0.2 * min(params.dx, params.dy) ** 2 / params.nu
+    return dataclasses.replace(params, dt=min(config.DT, dt_limit))
+
+
+def _check(serial: tuple, parallel: tuple) -> float:
+    """Verify serial and parallel ``(u, v, p)`` agree and return the max difference."""
+    for s, q in zip(serial, parallel):
+        if not np.all(np.isfinite(s)):
+            raise RuntimeError("Serial solution diverged; reduce dt or coarsen the grid")
+        if not np.array_equal(s, q):
+            raise RuntimeError(
+                f"Parallel result differs from serial (max |diff| = {np.abs(s - q).max():.2e})"
+            )
+    return max(float(np.abs(s - q).max()) for s, q in zip(serial, parallel))
+
+
+def strong_scaling(nx: int, ny: int, nt: int, max_workers: int) -> None:
+    """Time a fixed ``nx x ny`` grid across increasing worker counts."""
+    params = _stable_parameters(nx, ny)
+    t_serial, reference = _timed(lambda: cavity_flow(nt, params))
+    print(f"\nStrong scaling: {nx}x{ny} grid, {nt} steps (serial {t_serial:.3f} s)")
+    print(f"{'workers':>8} {'time [s]':>10} {'speedup':>8} {'efficiency':>10} {'max |diff|':>11}")
+    for workers in _worker_counts(max_workers):
+        elapsed, result = _timed(lambda: parallel_cavity_flow(nt, params, workers))
+        speedup = t_serial / elapsed
+        print(
+            f"{workers:>8} {elapsed:>10.3f} {speedup:>8.2f} "
+            f"{speedup / workers:>10.1%} {_check(reference, result):>11.2e}"
+        )
+
+
+def weak_scaling(nx: int, rows_per_worker: int, nt: int, max_workers: int) -> None:
+    """Time grids whose row count grows in proportion to the worker count."""
+    print(f"\nWeak scaling: {nx} columns, {rows_per_worker} interior rows per worker, {nt} steps")
+    print(f"{'workers':>8} {'grid':>12} {'time [s]':>10} {'efficiency':>10} {'max |diff|':>11}")
+    t_base = None
+    for workers in _worker_counts(max_workers):
+        ny = rows_per_worker * workers + 2
+        params = _stable_parameters(nx, ny)
+        _, reference = _timed(lambda: cavity_flow(nt, params))
+        elapsed, result = _timed(lambda: parallel_cavity_flow(nt, params, workers))
+        t_base = t_base or elapsed
+        print(
+            f"{workers:>8} {f'{nx}x{ny}':>12} {elapsed:>10.3f} "
+            f"{t_base / elapsed:>10.1%} {_check(reference, result):>11.2e}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nx", type=int, default=161)
+    parser.add_argument("--ny", type=int, default=161)
+    parser.add_argument("--nt", type=int, default=100)
+    parser.add_argument("--rows-per-worker", type=int, default=40)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    strong_scaling(args.nx, args.ny, args.nt, args.max_workers)
+    weak_scaling(args.nx, args.rows_per_worker, args.nt, args.max_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Configuration module for the Navier-Stokes cavity flow solver.
+
+Grid resolution, fluid properties, and time-stepping parameters for
+Step 11 of the *12 Steps to Navier-Stokes* curriculum, exposed through
+environment variables with sensible defaults.
+"""
+
+import os
+
+
+# Spatial Discretization
+NX = int(os.environ.get("CFD_NX", "41"))
+NY = int(os.environ.get("CFD_NY", "41"))
+DOMAIN_LENGTH_X = float(os.environ.get("CFD_DOMAIN_LENGTH_X", "2.0"))
+DOMAIN_LENGTH_Y = float(os.environ.get("CFD_DOMAIN_LENGTH_Y", "2.0"))
+
+# Time Stepping
+NT = int(os.environ.get("CFD_NT", "500"))
+NIT = int(os.environ.get("CFD_NIT", "50"))
+DT = float(os.environ.get("CFD_DT", "0.001"))
+
+# Fluid Properties
+RHO = float(os.environ.get("CFD_RHO", "1.0"))
+NU = float(os.environ.get("CFD_NU", "0.1"))
+LID_VELOCITY = float(os.environ.get("CFD_LID_VELOCITY", "1.0"))
+
+# Parallel Execution
+NUM_WORKERS = int(os.environ.get("CFD_NUM_WORKERS", str(os.cpu_count() or 1)))
+
+# Snapshot Output and Restart Checkpoints
+OUTPUT_DIR = os.environ.get("CFD_OUTPUT_DIR", "cavity_run")
+SNAPSHOT_EVERY = int(os.environ.get("CFD_SNAPSHOT_EVERY", "10"))
+CHECKPOINT_EVERY = int(os.environ.get("CFD_CHECKPOINT_EVERY", "100"))
+SNAPSHOT_CHUNK_SIZE = int(os.environ.get("CFD_SNAPSHOT_CHUNK_SIZE", "32"))
+SNAPSHOT_QUEUE_SIZE = int(os.environ.get("CFD_SNAPSHOT_QUEUE_SIZE", "8"))
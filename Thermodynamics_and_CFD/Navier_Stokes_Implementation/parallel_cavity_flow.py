@@ -0,0 +1,268 @@
+"""
+Shared-memory domain decomposition for the cavity flow solver.
+
+The grid is split into horizontal strips of rows, one per worker process.
+All fields live in ``multiprocessing.shared_memory`` blocks that every
+worker maps as NumPy views, so no field data is ever pickled or copied
+between processes. A worker writes only the rows it owns and reads its
+neighbours' edge rows (the halo) directly from the shared buffers; a
+``multiprocessing.Barrier`` after each pressure sweep and each velocity
+update publishes those halo rows before anyone reads them. A watchdog
+thread in the parent aborts the barrier and terminates the remaining
+workers if any worker dies, so a killed process cannot deadlock the run.
+Snapshot and checkpoint callbacks run in the parent while the workers are
+parked on a second barrier, so output never copies a field between processes.
+
+Each worker runs the exact kernels of ``cavity_flow.advance`` on its own
+band, so results are bitwise identical to the serial solver.
+"""
+
+import logging
+import multiprocessing as mp
+import threading
+from multiprocessing import connection, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from cavity_flow import FlowParameters, StepCallback, advance
+
+logger = logging.getLogger(__name__)
+
+_FIELD_SHAPES = {
+    "u": lambda ny, nx: (2, ny, nx),
+    "v": lambda ny, nx: (2, ny, nx),
+    "p": lambda ny, nx: (2, ny, nx),
+    "b": lambda ny, nx: (ny, nx),
+}
+
+
+def decompose_rows(ny: int, num_workers: int) -> List[Tuple[int, int]]:
+    """Split rows ``[0, ny)`` into contiguous ``(lo, hi)`` strips.
+
+    Interior rows are balanced across workers; the first and last strips
+    additionally own the bottom and lid boundary rows.
+    """
+    interior = ny - 2
+    if num_workers < 1 or num_workers > interior:
+        raise ValueError(
+            f"num_workers must be between 1 and {interior} for ny={ny}, got {num_workers}"
+        )
+    base, extra = divmod(interior, num_workers)
+    strips = []
+    lo = 1
+    for rank in range(num_workers):
+        hi = lo + base + (1 if rank < extra else 0)
+        strips.append((lo, hi))
+        lo = hi
+    strips[0] = (0, strips[0][1])
+    strips[-1] = (strips[-1][0], ny)
+    return strips
+
+
+def _as_arrays(
+    blocks: Dict[str, shared_memory.SharedMemory], ny: int, nx: int
+) -> Dict[str, np.ndarray]:
+    """Wrap shared-memory blocks as zero-copy NumPy views."""
+    return {
+        key: np.ndarray(_FIELD_SHAPES[key](ny, nx), dtype=np.float64, buffer=block.buf)
+        for key, block in blocks.items()
+    }
+
+
+def _worker(
+    names: Dict[str, str],
+    params: FlowParameters,
+    nt: int,
+    start_step: int,
+    lo: int,
+    hi: int,
+    barrier,
+    output_barrier,
+    callback_every: int,
+) -> None:
+    """Advance the strip ``[lo, hi)`` for *nt* steps in lockstep with its peers.
+
+    At every step divisible by *callback_every* the worker waits twice on
+    *output_barrier*: once to hand the fields to the parent and once for
+    the parent to finish reading them.
+    """
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, name in names.items()}
+    arrays = _as_arrays(blocks, params.ny, params.nx)
+    try:
+        u_cur, p_cur = 0, 0
+        for step in range(start_step + 1, start_step + nt + 1):
+            u_cur, p_cur = advance(
+                arrays["u"], arrays["v"], arrays["p"], arrays["b"],
+                params, u_cur, p_cur, lo, hi, barrier.wait,
+            )
+            if output_barrier is not None and step % callback_every == 0:
+                output_barrier.wait()
+                output_barrier.wait()
+    except threading.BrokenBarrierError:
+        logger.warning("Worker for rows [%d, %d) stopped: a peer worker failed", lo, hi)
+        raise SystemExit(1)
+    except Exception:
+        logger.exception("Worker for rows [%d, %d) failed", lo, hi)
+        _abort_all([barrier, output_barrier])
+        raise
+    finally:
+        arrays = None
+        for block in blocks.values():
+            block.close()
+
+
+def _abort_all(barriers: List) -> None:
+    for barrier in barriers:
+        if barrier is not None:
+            barrier.abort()
+
+
+def _watch_workers(workers: List[mp.Process], barriers: List) -> None:
+    """Abort *barriers* and terminate the survivors once any worker exits abnormally.
+
+    Workers that raise abort the barriers themselves, but one that is killed
+    outright (OOM killer, SIGKILL, ``os._exit``) never reaches that code and
+    would leave its peers waiting at a barrier forever.
+    """
+    pending = {worker.sentinel: worker for worker in workers}
+    while pending:
+        for sentinel in connection.wait(list(pending)):
+            worker = pending.pop(sentinel)
+            # The sentinel closes before the child is reaped; join() returns at
+            # once here but is needed before exitcode is meaningful.
+            worker.join()
+            if worker.exitcode != 0:
+                logger.error("Worker %s exited with code %s", worker.name, worker.exitcode)
+                _abort_all(barriers)
+                for survivor in pending.values():
+                    survivor.terminate()
+                return
+
+
+def _publish_steps(
+    arrays: Dict[str, np.ndarray],
+    params: FlowParameters,
+    nt: int,
+    start_step: int,
+    output_barrier,
+    callback: StepCallback,
+    callback_every: int,
+) -> None:
+    """Hand the shared fields to *callback* while the workers are parked."""
+    for elapsed, step in enumerate(range(start_step + 1, start_step + nt + 1), start=1):
+        if step % callback_every:
+            continue
+        try:
+            output_barrier.wait()
+        except threading.BrokenBarrierError:
+            return  # a worker failed; the caller reports it from the exit codes
+        u_cur = elapsed % 2
+        p_cur = (elapsed * params.nit) % 2
+        callback(step, arrays["u"][u_cur], arrays["v"][u_cur], arrays["p"][p_cur])
+        try:
+            output_barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+
+
+def parallel_cavity_flow(
+    nt: int,
+    params: FlowParameters,
+    num_workers: Optional[int] = None,
+    initial: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    start_step: int = 0,
+    callback: Optional[StepCallback] = None,
+    callback_every: int = 1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run the cavity solver across *num_workers* processes and return ``(u, v, p)``.
+
+    *initial* and *start_step* behave as in ``cavity_flow.cavity_flow``.
+    *callback* runs in the parent at every step divisible by
+    *callback_every*, with views of the shared fields, while the workers
+    wait for it on a second barrier. The buffer indices for a step depend
+    only on the steps elapsed and ``params.nit``, so the parent recovers
+    them without communicating with the workers.
+    """
+    if num_workers is None:
+        # The default follows the core count but cannot exceed the interior rows.
+        num_workers = min(config.NUM_WORKERS, params.ny - 2)
+    strips = decompose_rows(params.ny, num_workers)
+
+    blocks = {}
+    arrays = None
+    try:
+        for key, shape_of in _FIELD_SHAPES.items():
+            nbytes = int(np.prod(shape_of(params.ny, params.nx))) * np.dtype(np.float64).itemsize
+            blocks[key] = shared_memory.SharedMemory(create=True, size=nbytes)
+        names = {key: block.name for key, block in blocks.items()}
+        arrays = _as_arrays(blocks, params.ny, params.nx)
+        for array in arrays.values():
+            array.fill(0.0)
+        if initial is not None:
+            arrays["u"][0], arrays["v"][0], arrays["p"][0] = initial
+
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(num_workers)
+        output_barrier = ctx.Barrier(num_workers + 1) if callback is not None else None
+        barriers = [barrier, output_barrier]
+        workers = [
+            ctx.Process(
+                target=_worker,
+                args=(
+                    names, params, nt, start_step, lo, hi,
+                    barrier, output_barrier, callback_every,
+                ),
+            )
+            for lo, hi in strips
+        ]
+        for worker in workers:
+            worker.start()
+        watchdog = threading.Thread(
+            target=_watch_workers, args=(workers, barriers), name="worker-watchdog", daemon=True
+        )
+        watchdog.start()
+        try:
+            if callback is not None:
+                _publish_steps(
+                    arrays, params, nt, start_step, output_barrier, callback, callback_every
+                )
+        except BaseException:
+            _abort_all(barriers)
+            for worker in workers:
+                worker.terminate()
+            raise
+        finally:
+            # Only the watchdog reaps workers while it runs: two threads joining
+            # the same child race in waitpid and can read a None exit code.
+            watchdog.join()
+            for worker in workers:
+                worker.join()
+        failed = [w.exitcode for w in workers if w.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} cavity flow worker(s) exited abnormally")
+
+        u_cur = nt % 2
+        p_cur = (nt * params.nit) % 2
+        return (
+            arrays["u"][u_cur].copy(),
+            arrays["v"][u_cur].copy(),
+            arrays["p"][p_cur].copy(),
+        )
+    finally:
+        arrays = None
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    flow = FlowParameters.from_config()
+    workers = min(config.NUM_WORKERS, flow.ny - 2)
+    u, v, p = parallel_cavity_flow(config.NT, flow, workers)
+    logger.info(
+        "Completed %d steps on a %dx%d grid with %d workers (max |u| = %.4f, max p = %.4f)",
+        config.NT, flow.nx, flow.ny, workers, np.abs(u).max(), p.max(),
+    )
@@ -0,0 +1,73 @@
+"""
+Run the cavity flow solver with streaming snapshot output.
+
+Snapshots and restart checkpoints are written to ``config.OUTPUT_DIR``
+by a background thread while the solver runs. With ``--resume`` the run
+continues from the latest checkpoint (or ``--resume-step``) instead of
+starting from rest. ``--workers`` above one runs the shared-memory
+parallel solver instead of the serial one.
+
+Usage:
+    python run_cavity_flow.py [--output cavity_run] [--workers 4] [--resume]
+                              [--preview preview.png]
+"""
+
+import argparse
+import logging
+import math
+
+import config
+from cavity_flow import FlowParameters, cavity_flow
+from parallel_cavity_flow import parallel_cavity_flow
+from snapshot_store import SnapshotReader, SnapshotWriter, load_checkpoint, render_preview
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default=config.OUTPUT_DIR)
+    parser.add_argument("--nt", type=int, default=config.NT, help="Total steps for the run")
+    parser.add_argument("--resume", action="store_true", help="Resume from the latest checkpoint")
+    parser.add_argument("--resume-step", type=int, help="Resume from a specific checkpoint step")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes (1 runs the serial solver)"
+    )
+    parser.add_argument("--preview", help="Render the last snapshot to this PNG path")
+    args = parser.parse_args()
+
+    params = FlowParameters.from_config()
+    initial, start_step = None, 0
+    if args.resume or args.resume_step is not None:
+        start_step, initial = load_checkpoint(args.output, args.resume_step)
+        if args.nt <= start_step:
+            parser.error(f"--nt {args.nt} must be past the resume checkpoint at step {start_step}")
+        logger.info("Resuming from checkpoint at step %d", start_step)
+
+    with SnapshotWriter(
+        args.output, params, resume_step=start_step if initial is not None else None
+    ) as writer:
+        if args.workers > 1:
+            # Only wake the parent on steps where the writer may save something.
+            every = math.gcd(writer.snapshot_every, writer.checkpoint_every)
+            parallel_cavity_flow(
+                args.nt - start_step, params, args.workers,
+                initial=initial, start_step=start_step,
+                callback=writer if every else None, callback_every=every or 1,
+            )
+        else:
+            cavity_flow(
+                args.nt - start_step, params,
+                initial=initial, start_step=start_step, callback=writer,
+            )
+    logger.info("Run complete: %d snapshots in %s", len(writer.steps), args.output)
+
+    if args.preview:
+        reader = SnapshotReader(args.output)
+        render_preview(reader, -1, args.preview)
+        logger.info("Preview written to %s", args.preview)
+
+
+if __name__ == "__main__":
+    main()
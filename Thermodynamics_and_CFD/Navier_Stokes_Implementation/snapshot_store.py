@@ -0,0 +1,328 @@
+"""
+Streaming snapshot output and restart checkpoints for cavity flow runs.
+
+Snapshots are appended to a chunked on-disk store: each chunk is a single
+``.npy`` file of shape ``(chunk_size, 3, ny, nx)`` holding ``u``, ``v`` and
+``p`` for consecutive saved steps, and ``index.json`` records which steps
+have been written. Writes happen on a background thread fed by a bounded
+queue, so the solver only pays for one array copy per snapshot and blocks
+only if the disk falls more than a queue's worth of snapshots behind.
+
+Checkpoints are compressed ``.npz`` files containing the full solver
+state at a given step; a run can resume from any of them. The reader
+memory-maps chunk files and returns single time slices without loading
+the rest of the run.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from cavity_flow import FlowParameters
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("u", "v", "p")
+MANIFEST_NAME = "index.json"
+_CHUNK_TEMPLATE = "chunk_{:05d}.npy"
+_CHECKPOINT_TEMPLATE = "checkpoint_{:07d}.npz"
+
+
+def _write_json_atomic(path: str, payload: dict) -> None:
+    """Replace *path* with *payload* so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def list_checkpoints(directory: str) -> List[int]:
+    """Return the steps of all checkpoints in *directory*, in ascending order."""
+    if not os.path.isdir(directory):
+        return []
+    steps = []
+    for name in os.listdir(directory):
+        if name.startswith("checkpoint_") and name.endswith(".npz"):
+            steps.append(int(name[len("checkpoint_"):-len(".npz")]))
+    return sorted(steps)
+
+
+def load_checkpoint(
+    directory: str, step: Optional[int] = None
+) -> Tuple[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Load the checkpoint at *step* (default: the latest) as ``(step, (u, v, p))``."""
+    if step is None:
+        steps = list_checkpoints(directory)
+        if not steps:
+            raise FileNotFoundError(f"No checkpoints found in {directory}")
+        step = steps[-1]
+    path = os.path.join(directory, _CHECKPOINT_TEMPLATE.format(step))
+    with np.load(path) as data:
+        return int(data["step"]), (data["u"], data["v"], data["p"])
+
+
+class SnapshotWriter:
+    """Background writer for snapshots and checkpoints.
+
+    Instances are callable with the solver's ``(step, u, v, p)`` callback
+    signature and decide from *snapshot_every* and *checkpoint_every*
+    which steps to persist. Pass *resume_step* to reopen an existing store
+    after restarting from that step's checkpoint; snapshots and checkpoints
+    recorded after it are discarded.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        params: FlowParameters,
+        snapshot_every: int = config.SNAPSHOT_EVERY,
+        checkpoint_every: int = config.CHECKPOINT_EVERY,
+        chunk_size: int = config.SNAPSHOT_CHUNK_SIZE,
+        queue_size: int = config.SNAPSHOT_QUEUE_SIZE,
+        resume_step: Optional[int] = None,
+    ) -> None:
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.checkpoint_every = checkpoint_every
+        self.shape = (len(FIELDS), params.ny, params.nx)
+        self.chunk_size = chunk_size
+        self.steps: List[int] = []
+        self._manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self._chunk: Optional[np.memmap] = None
+        self._chunk_index = -1
+        self._error: Optional[BaseException] = None
+
+        os.makedirs(directory, exist_ok=True)
+        if resume_step is not None and os.path.exists(self._manifest_path):
+            self._reopen(resume_step)
+        elif os.path.exists(self._manifest_path):
+            raise FileExistsError(
+                f"{directory} already contains a snapshot store; pass resume_step to continue it"
+            )
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="snapshot-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _reopen(self, resume_step: int) -> None:
+        """Adopt an existing manifest, dropping snapshots after *resume_step*."""
+        with open(self._manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        if tuple(manifest["shape"]) != self.shape:
+            raise ValueError(
+                f"Store shape {tuple(manifest['shape'])} does not match grid {self.shape}"
+            )
+        self.chunk_size = manifest["chunk_size"]
+        self.steps = [step for step in manifest["steps"] if step <= resume_step]
+        for step in list_checkpoints(self.directory):
+            if step > resume_step:
+                os.remove(os.path.join(self.directory, _CHECKPOINT_TEMPLATE.format(step)))
+        # Persist the truncation now so the manifest never maps slots to stale steps.
+        self._flush()
+        logger.info(
+            "Resuming snapshot store at step %d (%d snapshots kept)",
+            resume_step, len(self.steps),
+        )
+
+    # -- producer side -------------------------------------------------------
+
+    def __call__(self, step: int, u: np.ndarray, v: np.ndarray, p: np.ndarray) -> None:
+        if self.snapshot_every and step % self.snapshot_every == 0:
+            self.append(step, u, v, p)
+        if self.checkpoint_every and step % self.checkpoint_every == 0:
+            self.checkpoint(step, u, v, p)
+
+    def append(self, step: int, u: np.ndarray, v: np.ndarray, p: np.ndarray) -> None:
+        """Queue a snapshot of ``(u, v, p)`` at *step*; blocks if the queue is full."""
+        self._put(("snapshot", step, np.stack((u, v, p))))
+
+    def checkpoint(self, step: int, u: np.ndarray, v: np.ndarray, p: np.ndarray) -> None:
+        """Queue a restart checkpoint of ``(u, v, p)`` at *step*."""
+        self._put(("checkpoint", step, np.stack((u, v, p))))
+
+    def _put(self, item: tuple) -> None:
+        self._raise_pending()
+        self._queue.put(item)
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Snapshot writer thread failed") from self._error
+
+    def close(self) -> None:
+        """Drain the queue, flush the current chunk and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_pending()
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Don't let a writer failure mask the exception raised by the solver.
+        try:
+            self.close()
+        except RuntimeError:
+            logger.exception("Snapshot writer also failed while handling %s", exc_type.__name__)
+
+    # -- writer thread -------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self._error is not None:
+                continue  # keep draining so the producer never blocks forever
+            kind, step, data = item
+            try:
+                if kind == "snapshot":
+                    self._write_snapshot(step, data)
+                else:
+                    self._write_checkpoint(step, data)
+            except BaseException as exc:
+                logger.exception("Failed to write %s for step %d", kind, step)
+                self._error = exc
+        try:
+            self._flush()
+        except BaseException as exc:
+            logger.exception("Failed to flush snapshot store")
+            self._error = self._error or exc
+        self._chunk = None
+
+    def _open_chunk(self, index: int) -> None:
+        self._flush()
+        path = os.path.join(self.directory, _CHUNK_TEMPLATE.format(index))
+        if os.path.exists(path):
+            self._chunk = np.load(path, mmap_mode="r+")
+        else:
+            self._chunk = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float64, shape=(self.chunk_size,) + self.shape
+            )
+        self._chunk_index = index
+
+    def _write_snapshot(self, step: int, data: np.ndarray) -> None:
+        chunk_index, slot = divmod(len(self.steps), self.chunk_size)
+        if chunk_index != self._chunk_index:
+            self._open_chunk(chunk_index)
+        self._chunk[slot] = data
+        self.steps.append(step)
+        if slot == self.chunk_size - 1:
+            self._flush()
+
+    def _write_checkpoint(self, step: int, data: np.ndarray) -> None:
+        # Make every snapshot up to this checkpoint durable before the
+        # checkpoint becomes visible, so a resume never loses them.
+        self._flush()
+        path = os.path.join(self.directory, _CHECKPOINT_TEMPLATE.format(step))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            np.savez_compressed(fh, step=step, u=data[0], v=data[1], p=data[2])
+        os.replace(tmp_path, path)
+        logger.debug("Wrote checkpoint for step %d", step)
+
+    def _flush(self) -> None:
+        if self._chunk is not None:
+            self._chunk.flush()
+        _write_json_atomic(
+            self._manifest_path,
+            {
+                "fields": list(FIELDS),
+                "shape": list(self.shape),
+                "chunk_size": self.chunk_size,
+                "steps": self.steps,
+            },
+        )
+
+
+class SnapshotReader:
+    """Lazy, memory-mapped access to the snapshots of a run.
+
+    Only the chunk files that are actually indexed get mapped, and only the
+    pages backing the requested time slice are read from disk.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        self.fields: Tuple[str, ...] = tuple(manifest["fields"])
+        self.shape: Tuple[int, ...] = tuple(manifest["shape"])
+        self.chunk_size: int = manifest["chunk_size"]
+        self.steps: List[int] = manifest["steps"]
+        self._chunks: Dict[int, np.memmap] = {}
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def _chunk(self, index: int) -> np.memmap:
+        if index not in self._chunks:
+            path = os.path.join(self.directory, _CHUNK_TEMPLATE.format(index))
+            self._chunks[index] = np.load(path, mmap_mode="r")
+        return self._chunks[index]
+
+    def snapshot(self, index: int) -> np.ndarray:
+        """Return the ``(3, ny, nx)`` slice for the *index*-th saved snapshot."""
+        if index < 0:
+            index += len(self.steps)
+        if not 0 <= index < len(self.steps):
+            raise IndexError(f"Snapshot index {index} out of range for {len(self)} snapshots")
+        chunk_index, slot = divmod(index, self.chunk_size)
+        return self._chunk(chunk_index)[slot]
+
+    def field(self, name: str, index: int) -> np.ndarray:
+        """Return the read-only ``(ny, nx)`` view of field *name* at snapshot *index*."""
+        return self.snapshot(index)[self.fields.index(name)]
+
+    def at_step(self, step: int) -> np.ndarray:
+        """Return the ``(3, ny, nx)`` slice saved at solver step *step*."""
+        try:
+            return self.snapshot(self.steps.index(step))
+        except ValueError:
+            raise KeyError(f"No snapshot saved at step {step}") from None
+
+
+def render_preview(
+    reader: SnapshotReader, index: int, output_path: str, field: str = "p"
+) -> None:
+    """Render one snapshot as a contour plot of *field* with velocity vectors.
+
+    Requires matplotlib, which is only needed for previews and is imported
+    lazily so the solver itself runs without it.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    u, v = reader.field("u", index), reader.field("v", index)
+    values = reader.field(field, index)
+    ny, nx = values.shape
+    x = np.linspace(0, config.DOMAIN_LENGTH_X, nx)
+    y = np.linspace(0, config.DOMAIN_LENGTH_Y, ny)
+    X, Y = np.meshgrid(x, y)
+    stride = max(1, nx // 20)
+
+    fig, ax = plt.subplots(figsize=(8, 6), dpi=100)
+    contour = ax.contourf(X, Y, values, alpha=0.6, cmap="viridis")
+    fig.colorbar(contour, ax=ax, label=field)
+    ax.quiver(
+        X[::stride, ::stride], Y[::stride, ::stride],
+        u[::stride, ::stride], v[::stride, ::stride],
+    )
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_title(f"Cavity flow at step {reader.steps[index]}")
+    fig.savefig(output_path, bbox_inches="tight")
+    plt.close(fig)
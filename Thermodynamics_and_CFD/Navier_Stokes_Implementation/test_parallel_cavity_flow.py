@@ -0,0 +1,73 @@
+"""Tests for the shared-memory parallel cavity flow solver."""
+
+import os
+
+import numpy as np
+import pytest
+
+import parallel_cavity_flow as pcf
+from cavity_flow import FlowParameters, cavity_flow
+
+
+@pytest.fixture
+def params():
+    return FlowParameters.from_config(nx=41, ny=41)
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_parallel_matches_serial_bitwise(params, num_workers):
+    serial = cavity_flow(50, params)
+    parallel = pcf.parallel_cavity_flow(50, params, num_workers)
+    for expected, actual in zip(serial, parallel):
+        assert np.array_equal(expected, actual)
+
+
+def test_healthy_runs_never_report_failed_workers():
+    params = FlowParameters.from_config(nx=21, ny=21)
+    for _ in range(30):
+        pcf.parallel_cavity_flow(2, params, 4)
+
+
+def test_default_worker_count_is_clamped_to_interior_rows(monkeypatch):
+    params = FlowParameters.from_config(nx=11, ny=5)
+    monkeypatch.setattr(pcf.config, "NUM_WORKERS", 64)
+    serial = cavity_flow(3, params)
+    parallel = pcf.parallel_cavity_flow(3, params)
+    for expected, actual in zip(serial, parallel):
+        assert np.array_equal(expected, actual)
+    with pytest.raises(ValueError):
+        pcf.parallel_cavity_flow(3, params, 64)
+
+
+def test_decompose_rows_rejects_more_workers_than_interior_rows():
+    with pytest.raises(ValueError):
+        pcf.decompose_rows(ny=10, num_workers=9)
+    with pytest.raises(ValueError):
+        pcf.decompose_rows(ny=10, num_workers=0)
+
+
+def test_decompose_rows_covers_grid_with_boundary_rows_on_edge_strips():
+    strips = pcf.decompose_rows(ny=41, num_workers=3)
+    assert strips[0][0] == 0
+    assert strips[-1][1] == 41
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(strips, strips[1:]))
+    interior = [min(hi, 40) - max(lo, 1) for lo, hi in strips]
+    assert sum(interior) == 39
+    assert max(interior) - min(interior) <= 1
+
+
+@pytest.mark.skipif(
+    pcf.mp.get_start_method() != "fork", reason="patching the worker requires fork"
+)
+def test_killed_worker_fails_run_instead_of_hanging(params, monkeypatch):
+    real_advance = pcf.advance
+
+    def dying_advance(*args, **kwargs):
+        lo = args[7]
+        if lo == 0:
+            os._exit(137)
+        return real_advance(*args, **kwargs)
+
+    monkeypatch.setattr(pcf, "advance", dying_advance)
+    with pytest.raises(RuntimeError):
+        pcf.parallel_cavity_flow(10, params, 2)
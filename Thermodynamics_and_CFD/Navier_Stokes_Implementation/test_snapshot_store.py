@@ -0,0 +1,93 @@
+"""Tests for streaming snapshot output and restart checkpoints."""
+
+import json
+
+import numpy as np
+import pytest
+
+from cavity_flow import FlowParameters, cavity_flow
+from parallel_cavity_flow import parallel_cavity_flow
+from snapshot_store import SnapshotReader, SnapshotWriter, load_checkpoint
+
+NT = 60
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def params():
+    return FlowParameters.from_config(nx=21, ny=21)
+
+
+def _writer(directory, params, **kwargs):
+    return SnapshotWriter(
+        str(directory), params, snapshot_every=7, checkpoint_every=20,
+        chunk_size=3, queue_size=2, **kwargs,
+    )
+
+
+def _run(directory, params, nt=NT):
+    with _writer(directory, params) as writer:
+        cavity_flow(nt, params, callback=writer)
+    return SnapshotReader(str(directory))
+
+
+def _assert_same_store(expected, actual):
+    assert actual.steps == expected.steps
+    for index in range(len(expected)):
+        assert np.array_equal(actual.snapshot(index), expected.snapshot(index))
+
+
+def test_resumed_run_matches_uninterrupted_run(tmp_path, params):
+    reference = _run(tmp_path / "reference", params)
+
+    def interrupt_at_step_50(step, u, v, p):
+        writer(step, u, v, p)
+        if step == 50:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        with _writer(tmp_path / "resumed", params) as writer:
+            cavity_flow(NT, params, callback=interrupt_at_step_50)
+
+    start_step, initial = load_checkpoint(str(tmp_path / "resumed"))
+    assert start_step == 40
+    with _writer(tmp_path / "resumed", params, resume_step=start_step) as writer:
+        cavity_flow(
+            NT - start_step, params, initial=initial, start_step=start_step, callback=writer
+        )
+
+    _assert_same_store(reference, SnapshotReader(str(tmp_path / "resumed")))
+
+
+def test_parallel_run_streams_the_same_store(tmp_path, params):
+    reference = _run(tmp_path / "serial", params)
+    with _writer(tmp_path / "parallel", params) as writer:
+        parallel_cavity_flow(NT, params, 3, callback=writer, callback_every=1)
+    _assert_same_store(reference, SnapshotReader(str(tmp_path / "parallel")))
+
+
+def test_at_step_matches_solver_output(tmp_path, params):
+    reader = _run(tmp_path, params)
+    assert reader.steps == [7, 14, 21, 28, 35, 42, 49, 56]
+    for step in (7, 28, 56):
+        u, v, p = cavity_flow(step, params)
+        assert np.array_equal(reader.at_step(step), np.stack((u, v, p)))
+    with pytest.raises(KeyError):
+        reader.at_step(8)
+
+
+def test_reopening_store_without_resume_step_raises(tmp_path, params):
+    _run(tmp_path, params, nt=10)
+    with pytest.raises(FileExistsError):
+        _writer(tmp_path, params)
+
+
+def test_reopen_truncates_manifest_on_disk(tmp_path, params):
+    _run(tmp_path, params)
+    writer = _writer(tmp_path, params, resume_step=40)
+    with open(tmp_path / "index.json", encoding="utf-8") as fh:
+        assert json.load(fh)["steps"] == [7, 14, 21, 28, 35]
+    writer.close()